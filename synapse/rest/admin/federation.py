@@ -13,22 +13,110 @@
 # limitations under the License.
 import logging
 from http import HTTPStatus
-from typing import TYPE_CHECKING, Tuple
+from typing import TYPE_CHECKING, Optional, Tuple, Union
+
+from unpaddedbase64 import decode_base64, encode_base64
 
 from synapse.api.constants import Direction
 from synapse.api.errors import Codes, NotFoundError, SynapseError
 from synapse.federation.transport.server import Authenticator
-from synapse.http.servlet import RestServlet, parse_enum, parse_integer, parse_string
+from synapse.http.servlet import (
+    RestServlet,
+    parse_boolean,
+    parse_enum,
+    parse_integer,
+    parse_string,
+)
 from synapse.http.site import SynapseRequest
 from synapse.rest.admin._base import admin_patterns, assert_requester_is_admin
 from synapse.storage.databases.main.transactions import DestinationSortOrder
 from synapse.types import JsonDict
+from synapse.util import json_decoder, json_encoder
 
 if TYPE_CHECKING:
     from synapse.server import HomeServer
 
 logger = logging.getLogger(__name__)
 
+# The maximum number of destinations that can be requested in one page.
+MAX_DESTINATIONS_LIMIT = 500
+
+# The values accepted for `order_by` by `ListDestinationsRestServlet`.
+_ALLOWED_ORDER_BY = tuple(dest.value for dest in DestinationSortOrder)
+_DEFAULT_ORDER_BY = DestinationSortOrder.DESTINATION.value
+
+# The position of each sort column in the rows returned by the store.
+_DESTINATION_ROW_INDEX = {
+    DestinationSortOrder.DESTINATION.value: 0,
+    DestinationSortOrder.RETRY_LAST_TS.value: 1,
+    DestinationSortOrder.RETTRY_INTERVAL.value: 2,
+    DestinationSortOrder.FAILURE_TS.value: 3,
+    DestinationSortOrder.LAST_SUCCESSFUL_STREAM_ORDERING.value: 4,
+}
+
+
+def _encode_destinations_cursor(
+    order_by: str,
+    row: Tuple[str, Optional[int], Optional[int], Optional[int], Optional[int]],
+) -> str:
+    """Serialise the sort key of a row of the destinations list into an opaque
+    token, which can be passed back as `after` to fetch the following page.
+    """
+    cursor = {
+        "order_by": order_by,
+        "value": row[_DESTINATION_ROW_INDEX[order_by]],
+        "destination": row[0],
+    }
+    return encode_base64(json_encoder.encode(cursor).encode("utf-8"), urlsafe=True)
+
+
+def _decode_destinations_cursor(
+    token: str, order_by: str
+) -> Tuple[Union[int, str, None], str]:
+    """Parse a token returned by `_encode_destinations_cursor`.
+
+    Args:
+        token: the token passed by the client.
+        order_by: the sort order of the current request.
+
+    Returns:
+        A tuple of the value of the sort column and the destination.
+
+    Raises:
+        SynapseError if the token is malformed or was issued for a different
+        sort order.
+    """
+    try:
+        cursor = json_decoder.decode(decode_base64(token).decode("utf-8"))
+        value = cursor["value"]
+        destination = cursor["destination"]
+        if order_by == DestinationSortOrder.DESTINATION.value:
+            valid_value = isinstance(value, str)
+        else:
+            # The sort columns are nullable BIGINTs, anything outside of their
+            # range would fail in the database driver.
+            valid_value = value is None or (
+                isinstance(value, int)
+                and not isinstance(value, bool)
+                and -(2**63) <= value < 2**63
+            )
+        valid = (
+            cursor["order_by"] == order_by
+            and isinstance(destination, str)
+            and valid_value
+        )
+    except Exception:
+        valid = False
+
+    if not valid:
+        raise SynapseError(
+            HTTPStatus.BAD_REQUEST,
+            "Query parameter after must be a token returned for the same order_by.",
+            errcode=Codes.INVALID_PARAM,
+        )
+
+    return value, destination
+
 
 class ListDestinationsRestServlet(RestServlet):
     """Get request to list all destinations.
@@ -40,9 +128,13 @@ class ListDestinationsRestServlet(RestServlet):
         200 OK with list of destinations if success otherwise an error.
 
     The parameters `from` and `limit` are required only for pagination.
-    By default, a `limit` of 100 is used.
+    By default, a `limit` of 100 is used, and at most 500 can be requested.
+    Instead of `from`, the parameter `after` can be set to the `next_cursor`
+    of the previous page, which is cheaper on large lists.
     The parameter `destination` can be used to filter by destination.
     The parameter `order_by` can be used to order the result.
+    The parameter `include_total` can be set to `false` to skip counting
+    the total number of destinations.
     """
 
     PATTERNS = admin_patterns("/federation/destinations$")
@@ -57,17 +149,12 @@ class ListDestinationsRestServlet(RestServlet):
         start = parse_integer(request, "from", default=0)
         limit = parse_integer(request, "limit", default=100)
 
-        if start < 0:
+        if start < 0 or not 0 <= limit <= MAX_DESTINATIONS_LIMIT:
             raise SynapseError(
                 HTTPStatus.BAD_REQUEST,
-                "Query parameter from must be a string representing a positive integer.",
-                errcode=Codes.INVALID_PARAM,
-            )
-
-        if limit < 0:
-            raise SynapseError(
-                HTTPStatus.BAD_REQUEST,
-                "Query parameter limit must be a string representing a positive integer.",
+                "Query parameters from and limit must be strings representing "
+                "positive integers, and limit must not exceed %d."
+                % (MAX_DESTINATIONS_LIMIT,),
                 errcode=Codes.INVALID_PARAM,
             )
 
@@ -76,16 +163,42 @@ class ListDestinationsRestServlet(RestServlet):
         order_by = parse_string(
             request,
             "order_by",
-            default=DestinationSortOrder.DESTINATION.value,
-            allowed_values=[dest.value for dest in DestinationSortOrder],
+            default=_DEFAULT_ORDER_BY,
+            allowed_values=_ALLOWED_ORDER_BY,
         )
 
         direction = parse_enum(request, "dir", Direction, default=Direction.FORWARDS)
 
-        destinations, total = await self._store.get_destinations_paginate(
-            start, limit, destination, order_by, direction
-        )
-        response = {
+        after = parse_string(request, "after")
+        include_total = parse_boolean(request, "include_total", default=True)
+
+        # Fetch one extra row to find out if there is a following page, so that
+        # this does not depend on the total.
+        if after is None:
+            destinations, total = await self._store.get_destinations_paginate(
+                start, limit + 1, destination, order_by, direction, include_total
+            )
+        else:
+            if start:
+                raise SynapseError(
+                    HTTPStatus.BAD_REQUEST,
+                    "Query parameters from and after cannot be used together.",
+                    errcode=Codes.INVALID_PARAM,
+                )
+
+            destinations, total = await self._store.get_destinations_keyset(
+                limit + 1,
+                _decode_destinations_cursor(after, order_by),
+                destination,
+                order_by,
+                direction,
+                include_total,
+            )
+
+        has_more = len(destinations) > limit
+        del destinations[limit:]
+
+        response: JsonDict = {
             "destinations": [
                 {
                     "destination": r[0],
@@ -96,10 +209,16 @@ class ListDestinationsRestServlet(RestServlet):
                 }
                 for r in destinations
             ],
-            "total": total,
         }
-        if (start + limit) < total:
-            response["next_token"] = str(start + len(destinations))
+        if total is not None:
+            response["total"] = total
+        if has_more:
+            if after is None:
+                response["next_token"] = str(start + len(destinations))
+            if destinations:
+                response["next_cursor"] = _encode_destinations_cursor(
+                    order_by, destinations[-1]
+                )
 
         return HTTPStatus.OK, response
 
@@ -14,7 +14,7 @@
 
 import logging
 from enum import Enum
-from typing import TYPE_CHECKING, Iterable, List, Mapping, Optional, Tuple, cast
+from typing import TYPE_CHECKING, Iterable, List, Mapping, Optional, Tuple, Union, cast
 
 import attr
 from canonicaljson import encode_canonical_json
@@ -28,7 +28,9 @@ from synapse.storage.database import (
     LoggingTransaction,
 )
 from synapse.storage.databases.main.cache import CacheInvalidationWorkerStore
+from synapse.storage.engines import PostgresEngine
 from synapse.types import JsonDict, StrCollection
+from synapse.util.caches import intern_string
 from synapse.util.caches.descriptors import cached, cachedList
 
 if TYPE_CHECKING:
@@ -474,9 +476,10 @@ class TransactionWorkerStore(CacheInvalidationWorkerStore):
         destination: Optional[str] = None,
         order_by: str = DestinationSortOrder.DESTINATION.value,
         direction: Direction = Direction.FORWARDS,
+        include_total: bool = True,
     ) -> Tuple[
         List[Tuple[str, Optional[int], Optional[int], Optional[int], Optional[int]]],
-        int,
+        Optional[int],
     ]:
         """Function to retrieve a paginated list of destinations.
         This will return a json list of destinations and the
@@ -488,6 +491,8 @@ class TransactionWorkerStore(CacheInvalidationWorkerStore):
             destination: search string in destination
             order_by: the sort order of the returned list
             direction: sort ascending or descending
+            include_total: whether to count the total number of destinations.
+                This needs an extra query over all matching destinations.
         Returns:
             A tuple of a list of tuples of destination information:
                 * destination
@@ -495,7 +500,8 @@ class TransactionWorkerStore(CacheInvalidationWorkerStore):
                 * retry_interval
                 * failure_ts
                 * last_successful_stream_ordering
-            and a count of total destinations.
+            and a count of total destinations, or None if `include_total`
+            is False.
         """
 
         def get_destinations_paginate_txn(
@@ -504,48 +510,193 @@ class TransactionWorkerStore(CacheInvalidationWorkerStore):
             List[
                 Tuple[str, Optional[int], Optional[int], Optional[int], Optional[int]]
             ],
-            int,
+            Optional[int],
+        ]:
+            return self._get_destinations_page_txn(
+                txn,
+                limit,
+                destination,
+                DestinationSortOrder(order_by).value,
+                direction,
+                include_total,
+                offset=start,
+            )
+
+        return await self.db_pool.runInteraction(
+            "get_destinations_paginate_txn", get_destinations_paginate_txn
+        )
+
+    async def get_destinations_keyset(
+        self,
+        limit: int,
+        after: Tuple[Union[int, str, None], str],
+        destination: Optional[str] = None,
+        order_by: str = DestinationSortOrder.DESTINATION.value,
+        direction: Direction = Direction.FORWARDS,
+        include_total: bool = True,
+    ) -> Tuple[
+        List[Tuple[str, Optional[int], Optional[int], Optional[int], Optional[int]]],
+        Optional[int],
+    ]:
+        """Function to retrieve a page of destinations which sort after a given row.
+
+        Unlike `get_destinations_paginate`, this does not skip over the rows of
+        the previous pages. When ordering by destination, the cost of fetching a
+        page therefore does not depend on how deep into the list it is.
+
+        Args:
+            limit: number of rows to retrieve
+            after: the sort key of the last row of the previous page, as a tuple
+                of the value of the `order_by` column and the destination.
+            destination: search string in destination
+            order_by: the sort order of the returned list
+            direction: sort ascending or descending
+            include_total: whether to count the total number of destinations.
+                This needs an extra query over all matching destinations.
+        Returns:
+            A tuple of a list of tuples of destination information, as for
+            `get_destinations_paginate`, and a count of total destinations, or
+            None if `include_total` is False.
+        """
+
+        def get_destinations_keyset_txn(
+            txn: LoggingTransaction,
+        ) -> Tuple[
+            List[
+                Tuple[str, Optional[int], Optional[int], Optional[int], Optional[int]]
+            ],
+            Optional[int],
         ]:
             order_by_column = DestinationSortOrder(order_by).value
 
             if direction == Direction.BACKWARDS:
-                order = "DESC"
+                comparison = "<"
             else:
-                order = "ASC"
+                comparison = ">"
 
-            args: List[object] = []
-            where_statement = ""
-            if destination:
-                args.extend(["%" + destination.lower() + "%"])
-                where_statement = "WHERE LOWER(destination) LIKE ?"
-
-            sql_base = f"FROM destinations {where_statement} "
-            sql = f"SELECT COUNT(*) as total_destinations {sql_base}"
-            txn.execute(sql, args)
-            count = cast(Tuple[int], txn.fetchone())[0]
+            # PostgreSQL sorts NULLs as larger than any value, SQLite as smaller.
+            nulls_first = isinstance(self.database_engine, PostgresEngine) == (
+                direction == Direction.BACKWARDS
+            )
 
-            sql = f"""
-                SELECT destination, retry_last_ts, retry_interval, failure_ts,
-                last_successful_stream_ordering
-                {sql_base}
-                ORDER BY {order_by_column} {order}, destination ASC
-                LIMIT ? OFFSET ?
-            """
-            txn.execute(sql, args + [limit, start])
-            destinations = cast(
-                List[
-                    Tuple[
-                        str, Optional[int], Optional[int], Optional[int], Optional[int]
-                    ]
-                ],
-                txn.fetchall(),
+            after_value, after_destination = after
+            if order_by_column == DestinationSortOrder.DESTINATION.value:
+                # Ties are impossible as the destination is unique.
+                clause = f"destination {comparison} ?"
+                args: List[object] = [after_destination]
+            elif after_value is None:
+                # Ties on the sort column are always broken by ascending
+                # destination.
+                clause = f"({order_by_column} IS NULL AND destination > ?)"
+                if nulls_first:
+                    clause = f"({clause} OR {order_by_column} IS NOT NULL)"
+                args = [after_destination]
+            else:
+                # Comparisons against NULL are never true, so rows with a
+                # NULL sort value only need to be included explicitly if
+                # they come after all other rows.
+                clause = (
+                    f"({order_by_column} {comparison} ?"
+                    f" OR ({order_by_column} = ? AND destination > ?)"
+                )
+                if not nulls_first:
+                    clause += f" OR {order_by_column} IS NULL"
+                clause += ")"
+                args = [after_value, after_value, after_destination]
+
+            return self._get_destinations_page_txn(
+                txn,
+                limit,
+                destination,
+                order_by_column,
+                direction,
+                include_total,
+                page_clause=clause,
+                page_args=args,
             )
-            return destinations, count
 
         return await self.db_pool.runInteraction(
-            "get_destinations_paginate_txn", get_destinations_paginate_txn
+            "get_destinations_keyset_txn", get_destinations_keyset_txn
         )
 
+    def _get_destinations_page_txn(
+        self,
+        txn: LoggingTransaction,
+        limit: int,
+        destination: Optional[str],
+        order_by_column: str,
+        direction: Direction,
+        include_total: bool,
+        page_clause: Optional[str] = None,
+        page_args: Iterable[object] = (),
+        offset: int = 0,
+    ) -> Tuple[
+        List[Tuple[str, Optional[int], Optional[int], Optional[int], Optional[int]]],
+        Optional[int],
+    ]:
+        """Fetch a page of destinations for `get_destinations_paginate` and
+        `get_destinations_keyset`.
+
+        Args:
+            txn: the database transaction.
+            limit: number of rows to retrieve
+            destination: search string in destination
+            order_by_column: the column to sort the returned list by
+            direction: sort ascending or descending
+            include_total: whether to count the total number of destinations
+                matching `destination`.
+            page_clause: an extra condition which the returned rows must match.
+                It is not applied to the total.
+            page_args: the arguments of `page_clause`.
+            offset: the number of rows to skip.
+        Returns:
+            A tuple of a list of tuples of destination information and a count
+            of total destinations, or None if `include_total` is False.
+        """
+        if direction == Direction.BACKWARDS:
+            order = "DESC"
+        else:
+            order = "ASC"
+
+        filter_clauses: List[str] = []
+        filter_args: List[object] = []
+        if destination:
+            filter_clauses.append("LOWER(destination) LIKE ?")
+            filter_args.append("%" + destination.lower() + "%")
+
+        count = None
+        if include_total:
+            where_statement = ""
+            if filter_clauses:
+                where_statement = "WHERE " + " AND ".join(filter_clauses)
+            sql = f"""
+                SELECT COUNT(*) as total_destinations
+                FROM destinations {where_statement}
+            """
+            txn.execute(sql, filter_args)
+            count = cast(Tuple[int], txn.fetchone())[0]
+
+        if page_clause is not None:
+            filter_clauses.append(page_clause)
+            filter_args.extend(page_args)
+
+        where_statement = ""
+        if filter_clauses:
+            where_statement = "WHERE " + " AND ".join(filter_clauses)
+
+        sql = f"""
+            SELECT destination, retry_last_ts, retry_interval, failure_ts,
+            last_successful_stream_ordering
+            FROM destinations {where_statement}
+            ORDER BY {order_by_column} {order}, destination ASC
+            LIMIT ? OFFSET ?
+        """
+        txn.execute(sql, filter_args + [limit, offset])
+        # The same hosts are also held by the state caches, so share the
+        # strings with them.
+        destinations = [(intern_string(r[0]), r[1], r[2], r[3], r[4]) for r in txn]
+        return destinations, count
+
     async def get_destination_rooms_paginate(
         self,
         destination: str,
@@ -11,9 +11,11 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import json
 from typing import List, Optional
 
 from parameterized import parameterized
+from unpaddedbase64 import encode_base64
 
 from twisted.test.proto_helpers import MemoryReactor
 
@@ -79,6 +81,16 @@ class FederationTestCase(unittest.HomeserverTestCase):
         self.assertEqual(400, channel.code, msg=channel.json_body)
         self.assertEqual(Codes.INVALID_PARAM, channel.json_body["errcode"])
 
+        # limit too large
+        channel = self.make_request(
+            "GET",
+            self.url + "?limit=100000",
+            access_token=self.admin_user_tok,
+        )
+
+        self.assertEqual(400, channel.code, msg=channel.json_body)
+        self.assertEqual(Codes.INVALID_PARAM, channel.json_body["errcode"])
+
         # negative from
         channel = self.make_request(
             "GET",
@@ -109,6 +121,26 @@ class FederationTestCase(unittest.HomeserverTestCase):
         self.assertEqual(400, channel.code, msg=channel.json_body)
         self.assertEqual(Codes.INVALID_PARAM, channel.json_body["errcode"])
 
+        # invalid include_total
+        channel = self.make_request(
+            "GET",
+            self.url + "?include_total=bar",
+            access_token=self.admin_user_tok,
+        )
+
+        self.assertEqual(400, channel.code, msg=channel.json_body)
+        self.assertEqual(Codes.INVALID_PARAM, channel.json_body["errcode"])
+
+        # invalid cursor
+        channel = self.make_request(
+            "GET",
+            self.url + "?after=foo",
+            access_token=self.admin_user_tok,
+        )
+
+        self.assertEqual(400, channel.code, msg=channel.json_body)
+        self.assertEqual(Codes.INVALID_PARAM, channel.json_body["errcode"])
+
         # invalid destination
         channel = self.make_request(
             "GET",
@@ -242,6 +274,148 @@ class FederationTestCase(unittest.HomeserverTestCase):
         self.assertEqual(len(channel.json_body["destinations"]), 1)
         self.assertNotIn("next_token", channel.json_body)
 
+    def test_include_total(self) -> None:
+        """Testing that `total` is only returned if requested, and that
+        pagination works without it"""
+
+        number_destinations = 20
+        self._create_destinations(number_destinations)
+
+        channel = self.make_request(
+            "GET",
+            self.url + "?limit=10&include_total=false",
+            access_token=self.admin_user_tok,
+        )
+
+        self.assertEqual(200, channel.code, msg=channel.json_body)
+        self.assertNotIn("total", channel.json_body)
+        self.assertEqual(len(channel.json_body["destinations"]), 10)
+        self.assertEqual(channel.json_body["next_token"], "10")
+
+        channel = self.make_request(
+            "GET",
+            self.url + "?from=10&limit=10&include_total=false",
+            access_token=self.admin_user_tok,
+        )
+
+        self.assertEqual(200, channel.code, msg=channel.json_body)
+        self.assertNotIn("total", channel.json_body)
+        self.assertEqual(len(channel.json_body["destinations"]), 10)
+        self.assertNotIn("next_token", channel.json_body)
+
+        channel = self.make_request(
+            "GET",
+            self.url + "?limit=10&include_total=true",
+            access_token=self.admin_user_tok,
+        )
+
+        self.assertEqual(200, channel.code, msg=channel.json_body)
+        self.assertEqual(channel.json_body["total"], number_destinations)
+
+    @parameterized.expand(
+        [
+            ("destination", "f"),
+            ("destination", "b"),
+            ("retry_last_ts", "f"),
+            ("retry_interval", "b"),
+            ("failure_ts", "f"),
+            ("last_successful_stream_ordering", "b"),
+        ]
+    )
+    def test_next_cursor(self, order_by: str, dir: str) -> None:
+        """Testing that paginating with `after` returns every destination once,
+        in the same order as paginating with `from`"""
+
+        number_destinations = 20
+        self._create_destinations(number_destinations)
+        # Add some destinations which tie on every column apart from `destination`
+        # and some with unset retry timings.
+        for i in range(5):
+            self._create_destination(f"other{i}.example.com")
+        for i in range(5):
+            self._create_destination(f"sub{i}.example.org", 50, 50, 50, 100)
+
+        url = f"{self.url}?order_by={order_by}&dir={dir}"
+        channel = self.make_request(
+            "GET",
+            url + "&limit=100",
+            access_token=self.admin_user_tok,
+        )
+        self.assertEqual(200, channel.code, msg=channel.json_body)
+        expected = [row["destination"] for row in channel.json_body["destinations"]]
+        self.assertEqual(len(expected), 30)
+
+        returned: List[str] = []
+        next_cursor = None
+        while True:
+            page_url = url + "&limit=7"
+            if next_cursor is not None:
+                page_url += f"&after={next_cursor}"
+            channel = self.make_request(
+                "GET",
+                page_url,
+                access_token=self.admin_user_tok,
+            )
+            self.assertEqual(200, channel.code, msg=channel.json_body)
+            self.assertEqual(channel.json_body["total"], 30)
+            self._check_fields(channel.json_body["destinations"])
+            returned.extend(
+                row["destination"] for row in channel.json_body["destinations"]
+            )
+            if next_cursor is not None:
+                self.assertNotIn("next_token", channel.json_body)
+
+            next_cursor = channel.json_body.get("next_cursor")
+            if next_cursor is None:
+                break
+
+        self.assertEqual(expected, returned)
+
+    def test_invalid_cursor(self) -> None:
+        """If `after` is invalid or combined with `from`, an error is returned."""
+        self._create_destinations(10)
+
+        channel = self.make_request(
+            "GET",
+            self.url + "?limit=5",
+            access_token=self.admin_user_tok,
+        )
+        self.assertEqual(200, channel.code, msg=channel.json_body)
+        next_cursor = channel.json_body["next_cursor"]
+
+        # `from` and `after` together
+        channel = self.make_request(
+            "GET",
+            self.url + f"?from=5&after={next_cursor}",
+            access_token=self.admin_user_tok,
+        )
+        self.assertEqual(400, channel.code, msg=channel.json_body)
+        self.assertEqual(Codes.INVALID_PARAM, channel.json_body["errcode"])
+
+        # cursor of a different sort order
+        channel = self.make_request(
+            "GET",
+            self.url + f"?order_by=failure_ts&after={next_cursor}",
+            access_token=self.admin_user_tok,
+        )
+        self.assertEqual(400, channel.code, msg=channel.json_body)
+        self.assertEqual(Codes.INVALID_PARAM, channel.json_body["errcode"])
+
+        # sort value which does not fit in a BIGINT
+        cursor = {
+            "order_by": "failure_ts",
+            "value": 10**30,
+            "destination": "sub0.example.com",
+        }
+        after = encode_base64(json.dumps(cursor).encode("utf-8"), urlsafe=True)
+        channel = self.make_request(
+            "GET",
+            self.url + f"?order_by=failure_ts&after={after}",
+            access_token=self.admin_user_tok,
+        )
+        self.assertEqual(400, channel.code, msg=channel.json_body)
+        self.assertEqual(Codes.INVALID_PARAM, channel.json_body["errcode"])
+
     def test_list_all_destinations(self) -> None:
         """List all destinations."""
         number_destinations = 5
@@ -510,9 +684,24 @@ class FederationTestCase(unittest.HomeserverTestCase):
         Args:
             number_destinations: Number of destinations to be created
         """
-        for i in range(number_destinations):
-            dest = f"sub{i}.example.com"
-            self._create_destination(dest, 50, 50, 50, 100)
+        # Insert all the rows in one transaction, rather than two per destination.
+        self.get_success(
+            self.store.db_pool.simple_insert_many(
+                table="destinations",
+                keys=(
+                    "destination",
+                    "failure_ts",
+                    "retry_last_ts",
+                    "retry_interval",
+                    "last_successful_stream_ordering",
+                ),
+                values=[
+                    (f"sub{i}.example.com", 50, 50, 50, 100)
+                    for i in range(number_destinations)
+                ],
+                desc="create_destinations",
+            )
+        )
 
     def _check_fields(self, content: List[JsonDict]) -> None:
         """Checks that the expected destination attributes are present in content
@@ -54,6 +54,19 @@ class RegistrationStoreTestCase(HomeserverTestCase):
             (self.get_success(self.store.get_user_by_id(self.user_id))),
         )
 
+    def test_is_server_admin(self) -> None:
+        user = UserID.from_string(self.user_id)
+        self.assertFalse(self.get_success(self.store.is_server_admin(user)))
+
+        self.get_success(self.store.register_user(self.user_id, self.pwhash))
+        self.assertFalse(self.get_success(self.store.is_server_admin(user)))
+
+        self.get_success(self.store.set_server_admin(user, True))
+        self.assertTrue(self.get_success(self.store.is_server_admin(user)))
+
+        self.get_success(self.store.set_server_admin(user, False))
+        self.assertFalse(self.get_success(self.store.is_server_admin(user)))
+
     def test_consent(self) -> None:
         self.get_success(self.store.register_user(self.user_id, self.pwhash))
         before_consent = self.clock.time_msec()